@@ -35,7 +35,7 @@ const file = require('gulp-file')
 const semver = require('semver')
 const sharedNeo4j = require('./test/internal/shared-neo4j').default
 const ts = require('gulp-typescript')
-const JasmineReporter = require('jasmine-spec-reporter').SpecReporter
+const ConsoleReporter = require('./spec/support/console-reporter')
 const karma = require('karma')
 const log = require('fancy-log')
 const JasmineExec = require('jasmine')
@@ -239,24 +239,7 @@ function logActiveNodeHandles () {
 }
 
 function newJasmineConsoleReporter () {
-  return new JasmineReporter({
-    colors: {
-      enabled: true
-    },
-    spec: {
-      displayDuration: true,
-      displayErrorMessages: true,
-      displayStacktrace: true,
-      displayFailed: true,
-      displaySuccessful: true,
-      displayPending: false
-    },
-    summary: {
-      displayFailed: true,
-      displayStacktrace: true,
-      displayErrorMessages: true
-    }
-  })
+  return new ConsoleReporter()
 }
 
 function runKarma (browser, cb) {
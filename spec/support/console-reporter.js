@@ -0,0 +1,47 @@
+/**
+ * Copyright (c) "Neo4j"
+ * Neo4j Sweden AB [http://neo4j.com]
+ *
+ * This file is part of Neo4j.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+const SpecReporter = require('jasmine-spec-reporter').SpecReporter
+
+/**
+ * Console reporter shared by the gulp test tasks and the jasmine CLI,
+ * which loads it through `jasmine --reporter=<path to this file>`.
+ */
+function ConsoleReporter () {
+  return new SpecReporter({
+    colors: {
+      enabled: true
+    },
+    spec: {
+      displayDuration: true,
+      displayErrorMessages: true,
+      displayStacktrace: true,
+      displayFailed: true,
+      displaySuccessful: true,
+      displayPending: false
+    },
+    summary: {
+      displayFailed: true,
+      displayStacktrace: true,
+      displayErrorMessages: true
+    }
+  })
+}
+
+module.exports = ConsoleReporter
@@ -6,9 +6,12 @@ Responsible for starting the test backend.
 import os
 import subprocess
 
+from common import npm_env, npm_script
+
 
 if __name__ == "__main__":
-    npm = ["npm", "--prefix", "testkit-backend"]
-    err = open("/artifacts/backenderr.log", "w")
-    out = open("/artifacts/backendout.log", "w")
-    subprocess.check_call([*npm, "start"], stdout=out, stderr=err)
+    err = open("/artifacts/backenderr.log", "wb")
+    out = open("/artifacts/backendout.log", "wb")
+    subprocess.check_call(
+        **npm_script("testkit-backend", "start", env=npm_env()),
+        stdout=out, stderr=err)
@@ -2,58 +2,161 @@
 Executed in Javascript driver container.
 Responsible for building driver and test backend.
 """
+import hashlib
 import os
-import subprocess
-import shutil
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
 
+from common import is_lite, npm_script, remove, run
 
-def run(args, env=None):
-    subprocess.run(
-        args, universal_newlines=True, stderr=subprocess.STDOUT, check=True, env=env)
 
+CORE_INPUTS = ["core/src", "core/tsconfig.json", "core/package-lock.json"]
+BOLT_CONNECTION_INPUTS = [
+    *CORE_INPUTS, "bolt-connection/src", "bolt-connection/types",
+    "bolt-connection/tsconfig.json", "bolt-connection/package-lock.json"]
+DRIVER_LITE_INPUTS = [
+    *BOLT_CONNECTION_INPUTS, "neo4j-driver-lite/src",
+    "neo4j-driver-lite/tsconfig.json", "neo4j-driver-lite/package-lock.json"]
 
-def build_core():
-    npm = ["npm", "--prefix", "./core/"]
-    run(['rm', '-fr', 'core/node_modules', 'core/lib', 'core/types'])
-    run([*npm, 'ci'])
-    run([*npm, 'run', 'build'])
 
+def install_dependencies(prefix):
+    """
+    Installs the dependencies of the package at prefix.
+    Skipped when node_modules was installed from the current package.json
+    and package-lock.json
+    """
+    node_modules = os.path.join(prefix, "node_modules")
+    manifest_sha_file = os.path.join(node_modules, ".package.sha256")
+    manifest_sha = tree_sha256(os.path.join(prefix, "package.json"),
+                               os.path.join(prefix, "package-lock.json"))
+    if os.path.isfile(manifest_sha_file):
+        with open(manifest_sha_file) as f:
+            if f.read() == manifest_sha:
+                return
+    # --no-save keeps npm from rewriting the committed package-lock.json,
+    # which npm ci never did
+    run(["npm", "--prefix", prefix, "install", "--no-save"])
+    with open(manifest_sha_file, "w") as f:
+        f.write(manifest_sha)
 
-def build_bolt_connection():
-    npm = ['npm', '--prefix', './bolt-connection/']
-    run(['rm', '-fr', 'bolt-connection/node_modules', 'bolt-connection/lib'])
-    run([*npm, 'ci'])
-    run([*npm, 'run', 'build'])
 
+def tree_sha256(*paths):
+    """
+    Returns the sha256 over the path and content of every file in paths
+    """
+    sha = hashlib.sha256()
+    for path in map(pathlib.Path, paths):
+        files = [path] if path.is_file() else sorted(
+            file for file in path.rglob("*") if file.is_file())
+        for file in files:
+            sha.update(str(file).encode())
+            sha.update(file.read_bytes())
+    return sha.hexdigest()
 
-def build_driver():
-    run(['rm', '-fr', 'node_modules', 'lib', 'build'])
-    run(["npm", "ci"])
+
+def build_package(prefix, outputs, inputs):
+    """
+    Runs the build script of the package at prefix.
+    Skipped when every output exists and was built from the same inputs
+    """
+    inputs_sha = tree_sha256(*inputs)
+    inputs_sha_file = os.path.join(outputs[0], ".inputs.sha256")
+    if (os.path.isfile(inputs_sha_file)
+            and all(os.path.exists(output) for output in outputs)):
+        with open(inputs_sha_file) as f:
+            if f.read() == inputs_sha:
+                return
+    remove(*outputs)
+    run(**npm_script(prefix, 'build'))
+    with open(inputs_sha_file, "w") as f:
+        f.write(inputs_sha)
+
+
+def install_core():
+    install_dependencies('./core/')
+
+
+def compile_core():
+    build_package('./core/', ['core/lib', 'core/types'], CORE_INPUTS)
+
+
+def install_bolt_connection():
+    install_dependencies('./bolt-connection/')
+
+
+def compile_bolt_connection():
+    build_package('./bolt-connection/', ['bolt-connection/lib'],
+                  BOLT_CONNECTION_INPUTS)
+
+
+def install_driver():
+    install_dependencies('./')
+
+
+def compile_driver():
+    remove('lib', 'build')
     run(["gulp", "nodejs"])
 
 
-def build_driver_lite():
-    npm = ['npm', '--prefix', './neo4j-driver-lite/']
-    run(['rm', '-fr', 'neo4j-driver-lite/node_modules', 'neo4j-driver-lite/lib'])
-    run([*npm, "ci"])
-    run([*npm, "run", "build"])
+def install_driver_lite():
+    install_dependencies('./neo4j-driver-lite/')
+
+
+def compile_driver_lite():
+    build_package('./neo4j-driver-lite/',
+                  ['neo4j-driver-lite/lib', 'neo4j-driver-lite/types'],
+                  DRIVER_LITE_INPUTS)
+
+
+def build_packages(isLite):
+    """
+    Builds the packages respecting the dependencies between them.
+    The root install also places the dependencies of its file: links, core
+    and bolt-connection, so it runs after their own installs and before they
+    compile. Every other step only waits for the steps it depends on.
+    """
+    jobs = int(os.environ.get("TESTKIT_BUILD_JOBS") or 0) or None
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        # Steps are submitted after the ones they depend on, so a worker
+        # never waits on a step which has not been picked up yet
+        def submit(step, *dependencies):
+            def run_step():
+                for dependency in dependencies:
+                    dependency.result()
+                step()
+            return executor.submit(run_step)
+
+        core_installed = submit(install_core)
+        bolt_connection_installed = submit(install_bolt_connection)
+        driver_installed = submit(
+            install_driver, core_installed, bolt_connection_installed)
+        if isLite:
+            driver_lite_installed = submit(install_driver_lite)
+
+        core_compiled = submit(compile_core, driver_installed)
+        bolt_connection_compiled = submit(
+            compile_bolt_connection, driver_installed, core_compiled)
+        compiled = [core_compiled, bolt_connection_compiled,
+                    submit(compile_driver, driver_installed)]
+        if isLite:
+            compiled.append(submit(
+                compile_driver_lite, driver_lite_installed,
+                bolt_connection_compiled))
+        for step in compiled:
+            step.result()
 
 
 def build_testkit_backend(isLite):
     npm = ["npm", "--prefix", "./testkit-backend/"]
-    run(['rm', '-fr', 'testkit-backend/node_modules'])
-    run([*npm, "install"])
     neo4jdriverPath = "neo4j@./"
-    if isLite: 
+    if isLite:
         neo4jdriverPath = "neo4j@./neo4j-driver-lite"
+    # Installing the driver as a local path links it into node_modules
+    # and resolves the remaining backend dependencies in the same pass
     run([*npm, "install", neo4jdriverPath])
 
 
 if __name__ == "__main__":
-    isLite = os.environ.get("TEST_DRIVER_LITE", False)
-    build_core()
-    build_bolt_connection()
-    if isLite:
-        build_driver_lite()
-    build_driver()
+    isLite = is_lite()
+    build_packages(isLite)
     build_testkit_backend(isLite)
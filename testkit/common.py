@@ -0,0 +1,98 @@
+"""
+Shared by the scripts executed in Javascript driver container.
+"""
+import json
+import os
+import shlex
+import shutil
+import subprocess
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+
+
+NPM_CACHE_DIR = "/artifacts/.npm-cache"
+
+# Points npm to the cache kept in the artifacts folder
+NPM_CONFIG = {
+    "npm_config_cache": NPM_CACHE_DIR,
+    "npm_config_prefer_offline": "true",
+    "npm_config_audit": "false",
+    "npm_config_fund": "false",
+}
+
+TRUTHY_VALUES = frozenset({"y", "yes", "t", "true", "1", "on"})
+
+os.makedirs(NPM_CACHE_DIR, exist_ok=True)
+
+
+def is_enabled(value):
+    return str(value).lower() in TRUTHY_VALUES
+
+
+@lru_cache(maxsize=1)
+def is_lite():
+    return is_enabled(os.environ.get("TEST_DRIVER_LITE", "false"))
+
+
+@lru_cache(maxsize=1)
+def _npm_env_template():
+    return {**os.environ, **NPM_CONFIG}
+
+
+def npm_env(env=None):
+    """
+    Returns env (os.environ by default) overlaid with NPM_CONFIG, so packages
+    are fetched from local disk instead of the registry on subsequent builds.
+    The default environment is built once, on first use, and shared between
+    calls. Other environments are overlaid through a ChainMap instead of
+    copied.
+    """
+    if env is None:
+        return _npm_env_template()
+    return ChainMap(NPM_CONFIG, env)
+
+
+def npm_script(prefix, script, *args, env=None):
+    """
+    Resolves the script of the package.json at prefix to the keyword arguments
+    of run, so the script is executed like `npm run` does but without starting
+    npm. Scripts which have pre/post hooks or need a shell still go through
+    npm.
+    """
+    with open(os.path.join(prefix, "package.json")) as f:
+        scripts = json.load(f)["scripts"]
+    command = shlex.split(scripts[script])
+    needs_npm = ("pre" + script in scripts or "post" + script in scripts
+                 or "=" in command[0]
+                 or any(c in scripts[script] for c in "&|;<>()$`"))
+    if needs_npm:
+        return {"args": ["npm", "--prefix", prefix, "run", script, "--",
+                         *args],
+                "env": env}
+    env = os.environ if env is None else env
+    bin_dir = os.path.abspath(os.path.join(prefix, "node_modules", ".bin"))
+    return {"args": [*command, *args],
+            "cwd": prefix,
+            "env": ChainMap(
+                {"PATH": bin_dir + os.pathsep + env.get("PATH", "")}, env)}
+
+
+def run(args, env=None, cwd=None):
+    subprocess.run(
+        args, stderr=subprocess.STDOUT, check=True, env=npm_env(env), cwd=cwd)
+
+
+def remove(*paths):
+    """
+    Removes the directory trees at paths, ignoring the ones which do not exist.
+    The trees are removed in parallel since the work is mostly syscalls.
+    """
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(partial(shutil.rmtree, onerror=_ignore_missing),
+                          paths))
+
+
+def _ignore_missing(function, path, exc_info):
+    if not isinstance(exc_info[1], FileNotFoundError):
+        raise exc_info[1]
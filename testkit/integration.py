@@ -1,24 +1,26 @@
-import subprocess
 import os
+from collections import ChainMap
 
+from common import is_lite, npm_script, run
 
-def run(args):
-    subprocess.run(
-        args, universal_newlines=True, stderr=subprocess.STDOUT, check=True)
 
+def test_driver(env):
+    run(["gulp", "test-browser"], env=env)
+    # Same specs and reporter as `gulp test-nodejs-integration`,
+    # without loading the gulpfile
+    run(["./node_modules/.bin/jasmine", "--config=spec/support/jasmine.json",
+         "--reporter=" + os.path.abspath("spec/support/console-reporter.js"),
+         "--filter=#integration*"], env=env)
 
-def test_driver():
-    run(["gulp", "test-browser"])
-    run(["gulp", "test-nodejs-integration"])
 
+def test_driver_lite(env):
+    run(**npm_script('neo4j-driver-lite', 'test:it', env=env))
+    run(**npm_script('neo4j-driver-lite', 'test:it:browser', env=env))
 
-def test_driver_lite():
-    run(['npm', '--prefix', 'neo4j-driver-lite', 'run', 'test:it'])
-    run(['npm', '--prefix', 'neo4j-driver-lite', 'run', 'test:it:browser'])
 
 if __name__ == "__main__":
-    os.environ["TEST_NEO4J_IPV6_ENABLED"] = "False"
-    if os.environ.get("TEST_DRIVER_LITE", False):
-        test_driver_lite()
+    env = ChainMap({"TEST_NEO4J_IPV6_ENABLED": "False"}, os.environ)
+    if is_lite():
+        test_driver_lite(env)
     else:
-        test_driver()
+        test_driver(env)
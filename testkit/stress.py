@@ -1,25 +1,24 @@
-import subprocess
 import os
+from collections import ChainMap
 
+from common import is_lite, run
 
-def run(args):
-    subprocess.run(
-        args, universal_newlines=True, stderr=subprocess.STDOUT, check=True)
 
+def test_driver(env):
+    run(["gulp", "run-stress-tests-without-jasmine"], env=env)
 
-def test_driver():
-    run(["gulp", "run-stress-tests-without-jasmine"])
 
-
-def test_driver_lite():
+def test_driver_lite(env):
     return
 
 
 if __name__ == "__main__":
-    os.environ['STRESS_TEST_MODE'] = 'fastest'
-    os.environ['RUNNING_TIME_IN_SECONDS'] = \
-        os.environ.get('TEST_NEO4J_STRESS_DURATION', 0)
-    if os.environ.get("TEST_DRIVER_LITE", False):
-        test_driver_lite()
+    env = ChainMap({
+        'STRESS_TEST_MODE': 'fastest',
+        'RUNNING_TIME_IN_SECONDS':
+            os.environ.get('TEST_NEO4J_STRESS_DURATION', '0'),
+    }, os.environ)
+    if is_lite():
+        test_driver_lite(env)
     else:
-        test_driver()
+        test_driver(env)
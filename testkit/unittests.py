@@ -3,13 +3,58 @@ Executed in Javascript driver container.
 Responsible for running unit tests.
 Assumes driver has been setup by build script prior to this.
 """
-import subprocess
 import os
+import subprocess
+
+from common import is_lite, npm_script, run
+
+
+# Packages with their own unit tests, together with the packages they depend
+# on.
+DEPENDENCIES = {
+    "core": {"core"},
+    "bolt-connection": {"core", "bolt-connection"},
+    "driver": {"core", "bolt-connection", "driver"},
+}
+
+PACKAGES = {"core", "bolt-connection", "neo4j-driver-lite"}
+
+# Top level files and folders only used by the driver itself. Changes to
+# anything else, like testkit or CI configuration, select every package.
+DRIVER_SOURCES = {"src", "test", "types", "spec", "package.json",
+                  "package-lock.json", "gulpfile.babel.js"}
+
+
+def changed_packages():
+    """
+    Returns the packages touched in the working tree since it diverged from
+    TEST_DIFF_BASE (origin/main by default), uncommitted changes included.
+    Returns None, so every test runs, when the changes are unknown or empty
+    or when they touch anything outside the packages and the driver sources.
+    """
+    base = os.environ.get("TEST_DIFF_BASE", "origin/main")
+    try:
+        merge_base = subprocess.check_output(
+            ["git", "merge-base", base, "HEAD"],
+            stderr=subprocess.DEVNULL).decode().strip()
+        # --no-renames lists both paths of a moved file
+        changed = subprocess.check_output(
+            ["git", "diff", "--name-only", "--no-renames", merge_base],
+            stderr=subprocess.DEVNULL)
+        untracked = subprocess.check_output(
+            ["git", "ls-files", "--others", "--exclude-standard"],
+            stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    files = (changed + untracked).decode().splitlines()
+    folders = {file.split("/")[0] for file in files}
+    if not folders or not folders <= PACKAGES | DRIVER_SOURCES:
+        return None
+    return {folder if folder in PACKAGES else "driver" for folder in folders}
 
 
-def run(args):
-    subprocess.run(
-        args, universal_newlines=True, stderr=subprocess.STDOUT, check=True)
+def is_affected(package, changed):
+    return changed is None or not DEPENDENCIES[package].isdisjoint(changed)
 
 
 def test_driver():
@@ -23,9 +68,11 @@ def test_driver_lite():
 
 
 if __name__ == "__main__":
-    run(['npm', '--prefix', 'core', 'run', 'test'])
-    run(['npm', '--prefix', 'bolt-connection', 'run', 'test'])
-    if os.environ.get("TEST_DRIVER_LITE", False):
+    changed = changed_packages()
+    for package in ("core", "bolt-connection"):
+        if is_affected(package, changed):
+            run(**npm_script(package, 'test'))
+    if is_lite():
         test_driver_lite()
-    else:
+    elif is_affected("driver", changed):
         test_driver()